@@ -8,32 +8,104 @@ Usage:
   - To scan specific directory: python fic.py -d /path/to/directory
   - To create a log file: python fic.py -l
   - To scan specific directory and create log: python fic.py -d /path/to/directory -l
-  - Additional options: --max-threads N, --timeout S
+  - Additional options: --max-workers N, --timeout S
 """
 
 import argparse
+import collections
 import concurrent.futures
+import ctypes
+import ctypes.util
+import errno
+import functools
 import logging
 from logging.handlers import QueueHandler, QueueListener
-from queue import Queue
+import mmap
 import multiprocessing
 import os
+import queue
+import re
 import shutil
+import signal
+import sqlite3
+import struct
 import subprocess
 import sys
 import time
+import threading
 import traceback
-from collections import Counter
+from contextlib import closing
 from pathlib import Path
-from typing import Dict, List, NamedTuple, Optional, Tuple
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 
 try:
     from tqdm import tqdm
 except ImportError:
     tqdm = None
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 VERSION = "1.4"
-FILE_READ_CHUNK = 8192  # Chunk size for file reading checks
+SCAN_THREADS = 8  # Directories listed concurrently during discovery
+VERIFY_BATCH_SIZE = 64  # Files passed to a single flac -t invocation
+VERIFY_BATCH_BYTES = 256 << 20  # Audio data past which a batch is closed early
+METAFLAC_BATCH_SIZE = 256  # Files passed to a single metaflac --show-md5sum invocation
+PROGRESS_UPDATE_FILES = 16  # Completed files reported to the progress bar at once
+PROGRESS_BAR_DELAY = 1.0  # Seconds before the progress bar first appears
+PREFETCH_BYTES = 1 << 30  # --prefetch: file data hinted ahead of the decoders at most
+
+# Keep console windows from flashing up for every child process on Windows
+_CREATE_FLAGS = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+# Absolute tool paths, filled in by set_tool_paths once check_dependencies has found them
+FLAC_BIN = 'flac'
+METAFLAC_BIN = 'metaflac'
+# Silent mode drops the banner and per-file progress; decoding errors are still reported
+FLAC_TEST_CMD = [FLAC_BIN, '-t', '-s']
+# The checksum is plain hex, so skip metaflac's conversion of output to the locale charset
+METAFLAC_MD5_CMD = [METAFLAC_BIN, '--no-utf8-convert', '--show-md5sum']
+# "fLaC" marker (4) + metadata block header (4) + STREAMINFO body (34, MD5 in the last 16)
+STREAMINFO_END = 42
+# --quick: frame sync code (either blocking strategy), padded bytes CRC'd per numpy group,
+# frames long enough to go to the plain CRC loop, boundaries tried past a failed segment
+FRAME_SYNC_RE = re.compile(rb'\xff[\xf8\xf9]')
+QUICK_GROUP_BYTES = 16 << 20
+QUICK_MAX_FRAME_BYTES = 256 << 10
+QUICK_MAX_MERGE = 8
+# libFLAC sonames tried when ctypes.util.find_library comes up empty (FLAC 1.4, 1.3, Windows, macOS)
+LIBFLAC_NAMES = ['libFLAC.so.12', 'libFLAC.so.8', 'libFLAC.dll', 'libFLAC.dylib']
+# FLAC__StreamDecoderErrorStatus names, in enum order
+LIBFLAC_ERRORS = ['FLAC__STREAM_DECODER_ERROR_STATUS_LOST_SYNC', 'FLAC__STREAM_DECODER_ERROR_STATUS_BAD_HEADER',
+                  'FLAC__STREAM_DECODER_ERROR_STATUS_FRAME_CRC_MISMATCH', 'FLAC__STREAM_DECODER_ERROR_STATUS_UNPARSEABLE_STREAM',
+                  'FLAC__STREAM_DECODER_ERROR_STATUS_BAD_METADATA']
+# In-process decoder library name and handle, filled in by set_libflac when libFLAC is found
+LIBFLAC = None
+_libflac = None
+# File types counted during discovery, grouped the way print_file_table shows them
+FILE_CATEGORIES = {
+    "Audio": ['.flac', '.mp3', '.wav', '.aac', '.m4a', '.ogg'],
+    "Images": ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'],
+    "Video": ['.mp4', '.mkv', '.avi', '.mov', '.wmv'],
+    "Text/Docs": ['.lrc', '.txt', '.log', '.cue', '.pdf'],
+    "Archives": ['.zip', '.rar', '.7z', '.tar', '.gz'],
+}
+# Slot of each tracked extension in the per-type counts list; the slot past the last is "other"
+EXT_INDEX = {ext: i for i, ext in enumerate(ext for extensions in FILE_CATEGORIES.values() for ext in extensions)}
+# Failures worth retrying when reading a checksum: metaflac's or our own messages for them,
+# and the matching errno values from reading STREAMINFO directly
+TRANSIENT_ERROR_RE = re.compile(r'resource busy|temporarily unavailable|interrupted system call|stale file handle|timed out', re.I)
+TRANSIENT_ERRNOS = {getattr(errno, name) for name in ('EAGAIN', 'EBUSY', 'EINTR', 'ESTALE', 'ETIMEDOUT') if hasattr(errno, name)}
+# Whether debug records are wanted, so hot paths skip formatting them; kept by set_log_level
+_LOG_DEBUG = False
+# Whether workers hint each file themselves before flac -t; off when the Prefetcher does it
+_WORKER_READAHEAD = True
+# What clean_flac_error drops from flac's stderr: blank lines and the banner and license
+# lines flac prints ahead of the actual error, each with its newline, plus indentation
+FLAC_BANNER_RE = re.compile(r'^(?:[ \t]*(?:(?:flac|Copyright|welcome to redistribute|This program is free software|'
+                            r'For more details)[^\n]*)?(?:\n|\Z)|[ \t]+)', re.M)
 
 # Color setup
 class Colors:
@@ -55,20 +127,28 @@ class Colors:
         except ImportError:
             self.enabled = False
             self.orange_red = self.yellow = self.green = self.lavender = self.reset = ''
+        # (prefix, suffix) per color name, built once so colorize is a single dict lookup
+        self._wrap = {name: (getattr(self, name), self.reset) for name in ('orange_red', 'yellow', 'green', 'lavender')}
 
     def colorize(self, text: str, color: str) -> str:
         """Apply color to text if enabled"""
         if not self.enabled:
             return text
-        color_code = getattr(self, color, '')
-        return f"{color_code}{text}{self.reset}"
+        prefix, suffix = self._wrap.get(color, ('', self.reset))
+        return f"{prefix}{text}{suffix}"
+
+# Verification outcomes; STATUS_NAMES holds the names used in the summary and the result cache
+PASSED, FAILED, NO_MD5 = 0, 1, 2
+STATUS_NAMES = ('passed', 'failed', 'no_md5')
+# (file_path, status, error, md5sum), sent back from the workers in every batch; a plain
+# tuple pickles smaller and faster than a NamedTuple, which is rebuilt through its class
+VerificationResult = Tuple[str, int, Optional[str], Optional[str]]
 
-class VerificationResult(NamedTuple):
-    """Container for verification results"""
-    file_path: str
-    status: str  # 'passed', 'failed', or 'no_md5'
-    error: Optional[str]
-    md5sum: Optional[str] = None
+class FlacFile(NamedTuple):
+    """A FLAC file found during discovery, with the stat fields used to detect changes"""
+    path: str
+    size: int
+    mtime_ns: int
 
 def setup_logging(enable_logging: bool, verbose: bool) -> Tuple[Optional[str], Optional[QueueListener]]:
     """Configure thread-safe logging to file and console if enabled"""
@@ -78,7 +158,9 @@ def setup_logging(enable_logging: bool, verbose: bool) -> Tuple[Optional[str], O
     timestamp = time.strftime("%Y%m%d_%H%M%S")
     log_filename = f"flac_check_{timestamp}.log"
     
-    log_queue = Queue()
+    # A multiprocessing queue so records from worker processes reach the listener too; a
+    # spawn-context one can also be handed to a pool respawned after a worker crash
+    log_queue = multiprocessing.get_context('spawn').Queue()
     queue_handler = QueueHandler(log_queue)
     
     file_handler = logging.FileHandler(log_filename)
@@ -89,9 +171,8 @@ def setup_logging(enable_logging: bool, verbose: bool) -> Tuple[Optional[str], O
     console_handler.setLevel(logging.ERROR)
     console_handler.setFormatter(logging.Formatter('%(levelname)s - %(message)s'))
     
-    logger = logging.getLogger('')
-    logger.setLevel(logging.DEBUG if verbose else logging.INFO)
-    logger.addHandler(queue_handler)
+    set_log_level(logging.DEBUG if verbose else logging.INFO)
+    logging.getLogger('').addHandler(queue_handler)
     
     listener = QueueListener(log_queue, file_handler, console_handler)
     listener.start()
@@ -99,163 +180,751 @@ def setup_logging(enable_logging: bool, verbose: bool) -> Tuple[Optional[str], O
     logging.info(f"FLAC Integrity Checker v{VERSION} started")
     return log_filename, listener
 
-def get_optimal_threads(max_threads: int) -> int:
-    """Calculate optimal number of threads with safety limits."""
-    try:
-        cpu_count = multiprocessing.cpu_count()
-        return min(max_threads, max(1, int(cpu_count * 0.75)))
-    except NotImplementedError:
-        logging.info(f"Thread detection failed: falling back to single thread")
-        return 1  # Fallback to single thread if detection fails
+def set_log_level(level: int) -> None:
+    """Set the root logger's level, and the flag hot paths test before formatting debug messages."""
+    global _LOG_DEBUG
+    logger = logging.getLogger('')
+    logger.setLevel(level)
+    _LOG_DEBUG = logger.isEnabledFor(logging.DEBUG)
+
+def set_tool_paths(flac_bin: str, metaflac_bin: str) -> None:
+    """Point every later flac/metaflac invocation at the given (ideally absolute) executables."""
+    global FLAC_BIN, METAFLAC_BIN, FLAC_TEST_CMD, METAFLAC_MD5_CMD
+    FLAC_BIN = flac_bin
+    METAFLAC_BIN = metaflac_bin
+    FLAC_TEST_CMD = [flac_bin, '-t', '-s']
+    METAFLAC_MD5_CMD = [metaflac_bin, '--no-utf8-convert', '--show-md5sum']
+
+def init_worker(log_queue: Optional[multiprocessing.Queue], log_level: int, flac_bin: str, metaflac_bin: str,
+                libflac_name: Optional[str], readahead: bool) -> None:
+    """Set up a verification worker process with the main process's tool paths, decoder and log listener."""
+    global _WORKER_READAHEAD
+    # Ctrl-C reaches the whole process group; the main process alone handles it and shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _WORKER_READAHEAD = readahead
+    set_tool_paths(flac_bin, metaflac_bin)
+    set_libflac(libflac_name)
+    if log_queue is None:
+        return
+    logging.getLogger('').handlers[:] = [QueueHandler(log_queue)]
+    set_log_level(log_level)
+
+def get_optimal_workers(max_workers: int) -> int:
+    """Calculate optimal number of worker processes with safety limits."""
+    # Count only the CPUs this process may run on; taskset and cpuset limits (as in
+    # containers) can leave far fewer than the machine has
+    if hasattr(os, 'sched_getaffinity'):
+        cpu_count = len(os.sched_getaffinity(0))
+    else:
+        cpu_count = os.cpu_count()
+    if not cpu_count:
+        logging.info(f"CPU detection failed: falling back to single worker")
+        return 1  # Fallback to single worker if detection fails
+    return min(max_workers, max(1, int(cpu_count * 0.75)))
 
 def clean_flac_error(error: str) -> str:
     """Clean up FLAC error messages with early return."""
-    if not error or not error.strip():
+    if not error:
         return ""
     
-    ignore_prefixes = ['flac', 'Copyright', 'welcome to redistribute', 'This program is free software', 'For more details']
-    return '\n'.join(line.strip() for line in error.splitlines() 
-                    if line.strip() and not any(line.strip().startswith(prefix) for prefix in ignore_prefixes))
+    # Progress updates end in a bare carriage return; treat those as line breaks too
+    return FLAC_BANNER_RE.sub('', error.replace('\r', '\n')).strip()
 
-def is_file_accessible(file_path: str) -> bool:
-    """Perform comprehensive checks on file accessibility without modification."""
-    try:
-        path = Path(file_path)
-        if not path.is_file():
-            return False
-        
-        if path.is_symlink():
+def advise_readahead(file_paths: List[str]) -> None:
+    """Ask the kernel to start reading files into the page cache ahead of flac -t (WILLNEED outlives our descriptor)."""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    for file_path in file_paths:
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
             try:
-                real_path = path.resolve(strict=True)
-                if not real_path.is_file():
-                    return False
-            except (OSError, RuntimeError):
-                return False
-        
-        if not os.access(file_path, os.R_OK):
-            return False
-        
-        with path.open('rb') as f:
-            f.read(FILE_READ_CHUNK)
-        
-        return path.stat().st_size > 0
-    except (OSError, PermissionError, UnicodeEncodeError):
-        return False
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+        except OSError:
+            continue  # Purely a hint; flac -t reports any real read problem
+
+class Prefetcher:
+    """Background thread advising readahead for queued batches, at most PREFETCH_BYTES ahead of the decoders."""
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._room = threading.Condition()
+        self._ahead = 0  # Bytes hinted whose files have not been verified yet
+        self._hinted = {}
+        self._finished = set()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='flac_prefetch', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                return
+            batch_bytes = sum(flac_file.size for flac_file in batch)
+            with self._room:
+                # An oversized batch still goes out once nothing else is outstanding
+                self._room.wait_for(lambda: self._closed or not self._ahead or self._ahead + batch_bytes <= PREFETCH_BYTES)
+                if self._closed:
+                    return
+                # Files verified while this batch waited need no hint
+                batch = [flac_file for flac_file in batch if flac_file.path not in self._finished]
+                self._finished.difference_update(flac_file.path for flac_file in batch)
+                for flac_file in batch:
+                    self._hinted[flac_file.path] = flac_file.size
+                    self._ahead += flac_file.size
+            advise_readahead([flac_file.path for flac_file in batch])
 
-def run_command(cmd: List[str], timeout: float, input_data: Optional[str] = None) -> Tuple[int, str, str]:
-    """Run a command with timeout and return (returncode, stdout, stderr)"""
-    logging.debug(f"Running command: {' '.join(cmd[:2])}...")
+    def feed(self, batches: Iterator[List[FlacFile]]) -> Iterator[List[FlacFile]]:
+        """Pass batches through unchanged, queueing each one for prefetching on the way."""
+        for batch in batches:
+            self._queue.put(batch)
+            yield batch
+
+    def release(self, file_paths: List[str]) -> None:
+        """Note that files have been verified, making room for further hints."""
+        with self._room:
+            for file_path in file_paths:
+                size = self._hinted.pop(file_path, None)
+                if size is None:
+                    self._finished.add(file_path)
+                else:
+                    self._ahead -= size
+            self._room.notify()
+
+    def close(self):
+        with self._room:
+            self._closed = True
+            self._room.notify()
+        self._queue.put(None)
+        self._thread.join()
+
+def start_command(cmd: List[str], pipe_stdin: bool = False, capture_stdout: bool = True) -> subprocess.Popen:
+    """Start a command with captured bytes output (stdout discarded unless capture_stdout) without waiting for it."""
+    if _LOG_DEBUG:
+        logging.debug(f"Running command: {' '.join(cmd[:2])}...")
+    return subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE if pipe_stdin else None,
+        stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        # Python's own descriptors are non-inheritable already, and skipping the close-all
+        # step lets CPython start the child with posix_spawn (vfork) instead of fork+exec
+        close_fds=False,
+        creationflags=_CREATE_FLAGS
+    )
+
+def finish_command(process: subprocess.Popen, timeout: float, input_data: Optional[bytes] = None) -> Tuple[int, bytes, bytes]:
+    """Wait for a started command with timeout and return (returncode, stdout, stderr)"""
+    with process:
+        try:
+            stdout, stderr = process.communicate(input=input_data, timeout=timeout)
+            return process.returncode, stdout or b"", stderr
+        except subprocess.TimeoutExpired:
+            process.kill()
+            return -1, b"", b"Command timed out"
+
+def run_command(cmd: List[str], timeout: float, input_data: Optional[bytes] = None,
+                capture_stdout: bool = True) -> Tuple[int, bytes, bytes]:
+    """Run a command with timeout and return (returncode, stdout, stderr) as bytes"""
     try:
-        with subprocess.Popen(
-            cmd,
-            stdin=subprocess.PIPE if input_data else None,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            encoding='utf-8',
-            errors='replace',
-            creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-        ) as process:
-            try:
-                stdout, stderr = process.communicate(input=input_data, timeout=timeout)
-                return process.returncode, stdout, stderr
-            except subprocess.TimeoutExpired:
-                process.kill()
-                return -1, "", "Command timed out"
+        return finish_command(start_command(cmd, pipe_stdin=bool(input_data), capture_stdout=capture_stdout),
+                              timeout, input_data)
     except FileNotFoundError:
-        return -1, "", f"Command not found: {cmd[0]}"
+        return -1, b"", f"Command not found: {cmd[0]}".encode('utf-8', 'replace')
     except (OSError, subprocess.SubprocessError) as e:
-        return -1, "", f"Subprocess error: {str(e)}"
+        return -1, b"", f"Subprocess error: {str(e)}".encode('utf-8', 'replace')
 
-def verify_flac(file_path: str, timeout: float, max_retries: int, verbose: bool) -> VerificationResult:
-    """Verify a FLAC file with comprehensive error handling, ensuring read-only access."""
-    last_error = ""
+def read_streaminfo_md5(file_path: str) -> Optional[str]:
+    """Return the MD5 recorded in a FLAC file's STREAMINFO block, or None if it does not lead the file."""
+    with open(file_path, 'rb') as f:
+        header = f.read(STREAMINFO_END)
+    # "fLaC", then a block header of type 0 (STREAMINFO, last-block flag aside) with its
+    # fixed 34-byte length; the MD5 is the final 16 bytes of that block
+    if len(header) < STREAMINFO_END or header[:4] != b'fLaC' or header[4] & 0x7F != 0 or header[5:8] != b'\x00\x00\x22':
+        return None
+    return header[STREAMINFO_END - 16:].hex()
+
+class _StreamInfo(ctypes.Structure):
+    _fields_ = [('min_blocksize', ctypes.c_uint), ('max_blocksize', ctypes.c_uint),
+                ('min_framesize', ctypes.c_uint), ('max_framesize', ctypes.c_uint),
+                ('sample_rate', ctypes.c_uint), ('channels', ctypes.c_uint), ('bits_per_sample', ctypes.c_uint),
+                ('total_samples', ctypes.c_uint64), ('md5sum', ctypes.c_ubyte * 16)]
+
+class _StreamMetadata(ctypes.Structure):
+    # Only the STREAMINFO member of the data union is ever read
+    _fields_ = [('type', ctypes.c_int), ('is_last', ctypes.c_int), ('length', ctypes.c_uint),
+                ('stream_info', _StreamInfo)]
+
+_WRITE_CALLBACK = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint), ctypes.c_void_p, ctypes.c_void_p)
+_METADATA_CALLBACK = ctypes.CFUNCTYPE(None, ctypes.c_void_p, ctypes.POINTER(_StreamMetadata), ctypes.c_void_p)
+_ERROR_CALLBACK = ctypes.CFUNCTYPE(None, ctypes.c_void_p, ctypes.c_int, ctypes.c_void_p)
+
+def find_libflac() -> Optional[str]:
+    """Return a loadable name for the libFLAC shared library, or None if it is not installed."""
+    found = ctypes.util.find_library('FLAC')
+    for name in ([found] if found else []) + LIBFLAC_NAMES:
+        try:
+            ctypes.CDLL(name)
+        except OSError:
+            continue
+        return name
+    return None
+
+def set_libflac(name: Optional[str]) -> None:
+    """Decode in-process through the named libFLAC from now on, or through flac -t if name is None."""
+    global LIBFLAC, _libflac
+    LIBFLAC = name
+    if name is None:
+        _libflac = None
+        return
+    lib = ctypes.CDLL(name)
+    lib.FLAC__stream_decoder_new.restype = ctypes.c_void_p
+    lib.FLAC__stream_decoder_set_md5_checking.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    lib.FLAC__stream_decoder_init_file.argtypes = [ctypes.c_void_p, ctypes.c_char_p, _WRITE_CALLBACK,
+                                                   _METADATA_CALLBACK, _ERROR_CALLBACK, ctypes.c_void_p]
+    for func in ('process_until_end_of_stream', 'get_state', 'finish', 'delete'):
+        getattr(lib, f'FLAC__stream_decoder_{func}').argtypes = [ctypes.c_void_p]
+    _libflac = lib
+
+def verify_flac_libflac(file_path: str, timeout: float) -> VerificationResult:
+    """Decode a FLAC file in-process with libFLAC, which checks frame CRCs and the MD5 signature itself."""
+    stream_info = {}
+    errors = []
+    decoded = [0]
+    deadline = time.monotonic() + timeout
+    timed_out = [False]
     
+    # The frame header starts with its block size, which is all the write callback needs
+    # to count samples; the decoded audio itself is only used by libFLAC's MD5 check.
+    # The callback runs once per frame, so it also enforces the timeout
+    def on_write(decoder, frame, buffer, client_data):
+        decoded[0] += frame[0]
+        if time.monotonic() > deadline:
+            timed_out[0] = True
+            return 1  # FLAC__STREAM_DECODER_WRITE_STATUS_ABORT
+        return 0  # FLAC__STREAM_DECODER_WRITE_STATUS_CONTINUE
+    
+    def on_metadata(decoder, metadata, client_data):
+        info = metadata.contents.stream_info
+        stream_info.update(total_samples=info.total_samples, md5=bytes(info.md5sum).hex())
+    
+    def on_error(decoder, status, client_data):
+        errors.append(LIBFLAC_ERRORS[status] if status < len(LIBFLAC_ERRORS) else f"error status {status}")
+    
+    callbacks = (_WRITE_CALLBACK(on_write), _METADATA_CALLBACK(on_metadata), _ERROR_CALLBACK(on_error))
+    filename = file_path.encode('utf-8') if sys.platform == 'win32' else os.fsencode(file_path)
+    decoder = _libflac.FLAC__stream_decoder_new()
+    if not decoder:
+        return file_path, FAILED, "System error: cannot allocate a FLAC decoder", None
+    try:
+        _libflac.FLAC__stream_decoder_set_md5_checking(decoder, 1)
+        init_status = _libflac.FLAC__stream_decoder_init_file(decoder, filename, *callbacks, None)
+        if init_status != 0:
+            return file_path, FAILED, f"Cannot open for decoding (init status {init_status})", None
+        completed = _libflac.FLAC__stream_decoder_process_until_end_of_stream(decoder)
+        state = _libflac.FLAC__stream_decoder_get_state(decoder)
+        md5_matched = _libflac.FLAC__stream_decoder_finish(decoder)
+    finally:
+        _libflac.FLAC__stream_decoder_delete(decoder)
+    
+    if errors:
+        error_msg = ", ".join(dict.fromkeys(errors))
+    elif timed_out[0]:
+        error_msg = f"Decoding timed out after {timeout} seconds"
+    elif not completed:
+        error_msg = f"Decoding stopped (decoder state {state})"
+    elif not stream_info:
+        error_msg = "No STREAMINFO block"
+    elif stream_info['total_samples'] and decoded[0] != stream_info['total_samples']:
+        error_msg = f"Decoded {decoded[0]} of {stream_info['total_samples']} samples"
+    elif not md5_matched:
+        error_msg = "MD5 signature mismatch"
+    else:
+        error_msg = None
+    if error_msg:
+        return file_path, FAILED, error_msg, None
+    
+    md5 = stream_info['md5']
+    if md5 == '0'*32:
+        return file_path, NO_MD5, None, None
+    return file_path, PASSED, None, md5
+
+def fetch_md5(file_path: str, timeout: float, max_retries: int) -> Optional[str]:
+    """Read a file's stored MD5, retrying only transient failures, or return None if it cannot be read."""
     for attempt in range(max_retries + 1):
         try:
-            if not is_file_accessible(file_path):
-                logging.info(f"File inaccessible: {file_path}")
-                return VerificationResult(file_path, 'failed', "File inaccessible or unreadable")
-            
-            returncode, _, stderr = run_command(['flac', '-t', file_path], timeout=timeout)
-            if returncode != 0:
-                error_msg = clean_flac_error(stderr) or "Unknown FLAC error"
-                logging.info(f"FLAC verification failed for {file_path}: {error_msg}")
-                return VerificationResult(file_path, 'failed', error_msg)
-            
-            returncode, stdout, stderr = run_command(['metaflac', '--show-md5sum', file_path], timeout=timeout/3)
-            if returncode != 0:
-                if attempt == max_retries:
-                    logging.info(f"MD5 check failed for {file_path}")
-                    return VerificationResult(file_path, 'failed', "MD5 check failed")
-                time.sleep(0.5 * (attempt + 1))
-                continue
-                
-            md5 = stdout.strip()
-            if not md5 or md5 == '0'*32:
-                logging.info(f"No MD5 found in {file_path}")
-                return VerificationResult(file_path, 'no_md5', None)
-            
-            logging.debug(f"File passed verification: {file_path}")
-            return VerificationResult(file_path, 'passed', None, md5)
+            md5 = read_streaminfo_md5(file_path)
+            if md5 is not None:
+                return md5
+            # STREAMINFO should always come first; leave unusual layouts to metaflac
+            returncode, stdout, stderr = run_command(METAFLAC_MD5_CMD + [file_path], timeout=timeout/3)
+            if returncode == 0:
+                return stdout.decode('ascii', 'replace').strip()
+            transient = bool(TRANSIENT_ERROR_RE.search(stderr.decode('utf-8', 'replace')))
+        except OSError as e:
+            if e.errno not in TRANSIENT_ERRNOS:
+                raise
+            transient = True
+        if not transient or attempt == max_retries:
+            return None
+        time.sleep(0.5 * (attempt + 1))
+    return None
+
+def verify_flac(file_path: str, timeout: float, max_retries: int, verbose: bool, decoded: bool = False) -> VerificationResult:
+    """Verify a FLAC file read-only; decoded=True skips flac -t when it has already passed the file."""
+    # A file that cannot be opened fails flac -t and is reported with flac's own error;
+    # a failed decode is final, so flac -t runs once and only the MD5 read is retried
+    if not decoded:
+        if _WORKER_READAHEAD:
+            advise_readahead([file_path])
+        returncode, _, stderr = run_command(FLAC_TEST_CMD + [file_path], timeout=timeout, capture_stdout=False)
+        if returncode != 0:
+            error_msg = clean_flac_error(stderr.decode('utf-8', 'replace')) or "Unknown FLAC error"
+            return file_path, FAILED, error_msg, None
+    
+    try:
+        md5 = fetch_md5(file_path, timeout, max_retries)
+    except OSError as e:
+        error_msg = f"System error: {str(e)}"
+        if verbose:
+            error_msg += f"\n{traceback.format_exc()}"
+        logging.error(f"Error processing {file_path}: {error_msg}")
+        return file_path, FAILED, error_msg, None
+    
+    if md5 is None:
+        return file_path, FAILED, "MD5 check failed", None
+    if not md5 or md5 == '0'*32:
+        return file_path, NO_MD5, None, None
+    return file_path, PASSED, None, md5
+
+def batch_md5s(file_paths: List[str], timeout: float) -> Dict[str, str]:
+    """Read the stored MD5 of many files with one metaflac run per METAFLAC_BATCH_SIZE paths, omitting unreadable ones."""
+    md5s = {}
+    for i in range(0, len(file_paths), METAFLAC_BATCH_SIZE):
+        chunk = file_paths[i:i + METAFLAC_BATCH_SIZE]
+        _, stdout, _ = run_command(METAFLAC_MD5_CMD + ['--'] + chunk, timeout=timeout / 3 * len(chunk))
+        if len(chunk) == 1:
+            # A lone file is printed without its name
+            if stdout.strip():
+                md5s[chunk[0]] = stdout.decode('ascii', 'replace').strip()
+            continue
+        wanted = set(chunk)
+        # Names come back exactly as passed, so decode them the way the paths were encoded
+        for line in os.fsdecode(stdout).splitlines():
+            file_path, _, md5 = line.rpartition(':')
+            if file_path in wanted:
+                md5s[file_path] = md5
+    return md5s
+
+def verify_flac_batch(file_paths: List[str], timeout: float, max_retries: int, verbose: bool) -> List[VerificationResult]:
+    """Verify several FLAC files with a single flac -t run, isolating failures per file."""
+    if _libflac is not None:
+        return [verify_flac_libflac(file_path, timeout) for file_path in file_paths]
+    
+    # Discovery has already checked each file is a non-empty regular file; one that has
+    # since gone or cannot be read fails flac -t and is reported with flac's own error
+    results = {}
+    returncode = -1
+    if len(file_paths) > 1:
+        if _WORKER_READAHEAD:
+            advise_readahead(file_paths)
+        returncode, _, _ = run_command(FLAC_TEST_CMD + file_paths, timeout=timeout * len(file_paths), capture_stdout=False)
+    
+    md5s = {}
+    for file_path in file_paths:
+        if returncode != 0:
+            # flac only names files by basename in its report, so a failing batch is
+            # re-checked one file at a time, which also keeps the per-file retries
+            results[file_path] = verify_flac(file_path, timeout, max_retries, verbose)
+            continue
+        try:
+            md5s[file_path] = read_streaminfo_md5(file_path)
+        except OSError:
+            md5s[file_path] = None
+    
+    # Files whose STREAMINFO does not lead share a metaflac run; any it cannot answer
+    # for are retried one at a time
+    unresolved = [file_path for file_path, md5 in md5s.items() if md5 is None]
+    if unresolved:
+        md5s.update(batch_md5s(unresolved, timeout))
+    
+    for file_path, md5 in md5s.items():
+        if md5 is None:
+            results[file_path] = verify_flac(file_path, timeout, max_retries, verbose, decoded=True)
+        elif not md5 or md5 == '0'*32:
+            results[file_path] = (file_path, NO_MD5, None, None)
+        else:
+            results[file_path] = (file_path, PASSED, None, md5)
+    
+    return [results[file_path] for file_path in file_paths]
+
+@functools.lru_cache(maxsize=None)
+def crc16_word_table() -> Tuple[int, ...]:
+    """Table mapping a CRC-16 register (polynomial 0x8005) to its value after one more zero word."""
+    byte_table = []
+    for i in range(256):
+        crc = i << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x8005) & 0xFFFF if crc & 0x8000 else (crc << 1) & 0xFFFF
+        byte_table.append(crc)
+    table = []
+    for crc in range(65536):
+        crc = ((crc << 8) & 0xFFFF) ^ byte_table[crc >> 8]
+        table.append(((crc << 8) & 0xFFFF) ^ byte_table[crc >> 8])
+    return tuple(table)
+
+def crc8(data) -> int:
+    """CRC-8 (polynomial 0x07) as used for FLAC frame headers."""
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+    return crc
+
+def crc16(data) -> int:
+    """CRC-16 of a byte string, computed a word at a time; 0 for a frame ending in its own CRC."""
+    table = crc16_word_table()
+    if len(data) % 2:
+        data = b'\x00' + bytes(data)  # leading zeros leave a zero-initialised CRC unchanged
+    crc = 0
+    for (word,) in struct.iter_unpack('>H', data):
+        crc = table[crc ^ word]
+    return crc
+
+def frame_crc16s(data, bounds: List[int]) -> List[int]:
+    """CRC-16 residues of the segments between consecutive offsets in bounds, grouped by similar length."""
+    count = len(bounds) - 1
+    residues = [0] * count
+    lengths = [bounds[i + 1] - bounds[i] for i in range(count)]
+    order = sorted(range(count), key=lengths.__getitem__)
+    while order and lengths[order[-1]] > QUICK_MAX_FRAME_BYTES:
+        i = order.pop()
+        residues[i] = crc16(data[bounds[i]:bounds[i + 1]])
+    
+    # tables[k] advances a register by k + 1 zero words, so eight words fold into one step
+    tables = [np.array(crc16_word_table(), dtype=np.uint16)]
+    for _ in range(7):
+        tables.append(tables[0][tables[-1]])
+    t1, t2, t3, t4, t5, t6, t7, t8 = tables
+    buf = np.frombuffer(data, dtype=np.uint8)
+    # Rows are padded to a multiple of eight words; two-byte words need the padding anyway
+    padded = [-(-length // 16) * 16 for length in lengths]
+    start = 0
+    while start < len(order):
+        # Shortest first, so the last row of a group sets its width
+        end = start + 1
+        while end < len(order) and (end - start + 1) * padded[order[end]] <= QUICK_GROUP_BYTES:
+            end += 1
+        group = order[start:end]
+        width = padded[group[-1]]
+        rows = np.zeros((len(group), width), dtype=np.uint8)
+        for row, i in enumerate(group):
+            rows[row, width - lengths[i]:] = buf[bounds[i]:bounds[i + 1]]
+        # One contiguous array of words per column so each step reads sequential memory
+        words = np.ascontiguousarray(rows.view('>u2').astype(np.uint16).T)
+        crc = np.zeros(len(group), dtype=np.uint16)
+        for col in range(0, len(words), 8):
+            crc = (t8[crc ^ words[col]] ^ t7[words[col + 1]] ^ t6[words[col + 2]] ^ t5[words[col + 3]] ^
+                   t4[words[col + 4]] ^ t3[words[col + 5]] ^ t2[words[col + 6]] ^ t1[words[col + 7]])
+        for row, i in enumerate(group):
+            residues[i] = int(crc[row])
+        start = end
+    del buf
+    return residues
+
+def frame_header_end(data, pos: int, size: int) -> Optional[Tuple[int, int]]:
+    """Return (offset just past the header, block size) for a valid FLAC frame header at pos, or None."""
+    if pos + 6 > size:
+        return None
+    block_size, sample_rate = data[pos + 2] >> 4, data[pos + 2] & 0x0F
+    channels, sample_bits, reserved = data[pos + 3] >> 4, (data[pos + 3] >> 1) & 0x07, data[pos + 3] & 0x01
+    if block_size == 0 or sample_rate == 15 or channels > 10 or sample_bits == 3 or reserved:
+        return None
+    # Frame or sample number, UTF-8 style: the lead byte gives the count of continuation bytes
+    lead = data[pos + 4]
+    extra = next((n for n, mask in enumerate((0x80, 0xE0, 0xF0, 0xF8, 0xFC, 0xFE, 0xFF))
+                  if lead & mask == (mask << 1) & 0xFF), None)
+    if extra is None:
+        return None
+    end = pos + 5 + extra
+    if end > size or any(byte & 0xC0 != 0x80 for byte in data[pos + 5:end]):
+        return None
+    if block_size == 1:
+        samples = 192
+    elif block_size <= 5:
+        samples = 576 << (block_size - 2)
+    elif block_size <= 7:
+        # Stored after the frame number as an 8- or 16-bit value minus one
+        samples = int.from_bytes(data[end:end + block_size - 5], 'big') + 1
+    else:
+        samples = 256 << (block_size - 8)
+    end += (block_size == 6) + 2 * (block_size == 7) + (sample_rate == 12) + 2 * (sample_rate in (13, 14))
+    if end >= size or crc8(data[pos:end]) != data[end]:
+        return None
+    return end + 1, samples
+
+def quick_verify_flac(file_path: str) -> VerificationResult:
+    """Check every frame's CRC-16 without decoding the audio or checking the MD5 signature."""
+    try:
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            size = len(data)
+            pos = 0
+            if data[:3] == b'ID3' and size >= 10:
+                # ID3v2 tag ahead of the stream: syncsafe length, plus a footer if flagged
+                pos = 10 + sum((data[6 + i] & 0x7F) << (7 * (3 - i)) for i in range(4)) + 10 * bool(data[5] & 0x10)
+            if data[pos:pos + 4] != b'fLaC':
+                return file_path, FAILED, "Not a FLAC stream", None
+            if pos + STREAMINFO_END > size:
+                return file_path, FAILED, "Truncated header", None
+            if data[pos + 4] & 0x7F == 0:
+                # STREAMINFO leads: the low 36 bits of its fifth 8-byte field are the sample count
+                total_samples = int.from_bytes(data[pos + 18:pos + 26], 'big') & ((1 << 36) - 1)
+                md5 = data[pos + 26:pos + 42].hex()
+            else:
+                total_samples, md5 = 0, None
+            pos += 4
+            while True:
+                if pos + 4 > size:
+                    return file_path, FAILED, "Truncated metadata", None
+                last = data[pos] & 0x80
+                pos += 4 + int.from_bytes(data[pos + 1:pos + 4], 'big')
+                if last:
+                    break
             
-        except (OSError, subprocess.SubprocessError) as e:
-            last_error = str(e)
-            if attempt == max_retries:
-                error_msg = f"System error: {last_error}"
-                if verbose:
-                    error_msg += f"\n{traceback.format_exc()}"
-                logging.error(f"Error processing {file_path}: {error_msg}")
-                return VerificationResult(file_path, 'failed', error_msg)
-            time.sleep(0.5 * (attempt + 1))
+            audio_end = size - 128 if size - 128 > pos and data[size - 128:size - 125] == b'TAG' else size
+            if frame_header_end(data, pos, audio_end) is None:
+                return file_path, FAILED, f"No frame header at byte {pos}", None
+            # Later frames use the same blocking strategy bit as the first
+            sync = bytes(data[pos:pos + 2])
+            bounds = []
+            block_sizes = []
+            for match in FRAME_SYNC_RE.finditer(data, pos, audio_end):
+                header = data[match.end() - 1] == sync[1] and frame_header_end(data, match.start(), audio_end)
+                if header:
+                    bounds.append(match.start())
+                    block_sizes.append(header[1])
+            bounds.append(audio_end)
+            residues = frame_crc16s(data, bounds)
             
-    return VerificationResult(file_path, 'failed', last_error)
-
-def find_files(root_dir: str) -> Tuple[List[str], Dict[str, int]]:
-    """Find all files in directory tree with file type counting."""
-    flac_files = []
-    file_types = Counter()
-    total_files = 0
+            # A sync pattern inside the audio data can pass as a header; a segment whose CRC fails
+            # may just be cut short by one, so try extending it over the next few boundaries.
+            # Only the frames the walk lands on count towards the stream's samples
+            i = 0
+            samples = 0
+            while i < len(residues):
+                samples += block_sizes[i]
+                if residues[i] == 0:
+                    i += 1
+                    continue
+                for j in range(i + 2, min(i + 2 + QUICK_MAX_MERGE, len(bounds))):
+                    if crc16(data[bounds[i]:bounds[j]]) == 0:
+                        i = j
+                        break
+                else:
+                    return file_path, FAILED, f"Frame CRC mismatch at byte {bounds[i]}", None
+            # A file cut off between frames has intact CRCs but comes up short
+            if total_samples and samples != total_samples:
+                return file_path, FAILED, f"Found {samples} of {total_samples} samples", None
+    except (OSError, ValueError) as e:
+        logging.error(f"Error processing {file_path}: {e}")
+        return file_path, FAILED, f"System error: {e}", None
     
+    if not md5 or md5 == '0'*32:
+        return file_path, NO_MD5, None, None
+    return file_path, PASSED, None, md5
+
+def quick_verify_batch(file_paths: List[str], timeout: float, max_retries: int, verbose: bool) -> List[VerificationResult]:
+    """Frame-CRC counterpart of verify_flac_batch; nothing is spawned, so there is nothing to time out or retry."""
+    return [quick_verify_flac(file_path) for file_path in file_paths]
+
+def recheck_batch(file_paths: List[str], timeout: float, max_retries: int, verbose: bool) -> List[VerificationResult]:
+    """Re-check a batch lost with a crashed worker one file at a time through flac -t, so a crash takes down only its own child."""
+    return [verify_flac(file_path, timeout, max_retries, verbose) for file_path in file_paths]
+
+def bounded_map(executor: concurrent.futures.Executor, fn, items, max_pending: int, new_executor,
+                fallback) -> Iterator[Tuple[object, concurrent.futures.Future]]:
+    """Yield (item, future) for each fn(item) task in completion order, keeping at most max_pending queued."""
+    # A worker that dies breaks its pool: the pool is replaced with new_executor() and every
+    # item lost with it runs once more through fallback, which is not retried again
+    pending = {}
+    lost = collections.deque()
+    items = iter(items)
+    try:
+        while True:
+            while len(pending) < max_pending:
+                if lost:
+                    item, task = lost.popleft(), fallback
+                else:
+                    item = next(items, None)
+                    if item is None:
+                        break
+                    task = fn
+                try:
+                    future = executor.submit(task, item)
+                except concurrent.futures.BrokenExecutor:
+                    # The pool broke after the last results came back; its queued items are caught below
+                    executor = new_executor()
+                    future = executor.submit(task, item)
+                pending[future] = item, task, executor
+            if not pending:
+                return
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                item, task, submitted_to = pending.pop(future)
+                if isinstance(future.exception(), concurrent.futures.BrokenExecutor):
+                    if submitted_to is executor:
+                        executor = new_executor()
+                    if task is not fallback:
+                        lost.append(item)
+                        continue
+                yield item, future
+    finally:
+        # Stopped early (as on Ctrl-C): drop queued work rather than waiting for all of it
+        for future in pending:
+            future.cancel()
+        executor.shutdown()
+
+def scan_directory(directory: str) -> Tuple[List[os.DirEntry], List[str]]:
+    """List a single directory, returning its regular files and subdirectories."""
+    files = []
+    subdirs = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            try:
+                # DirEntry answers both checks from the directory listing itself on most
+                # platforms; only symlinked files need an extra stat to be followed
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file():
+                    if entry.name.lower().endswith('.flac'):
+                        # The only stat discovery needs; taking it here overlaps it with the
+                        # other listings in flight, and DirEntry caches it for iter_flac_files
+                        entry.stat()
+                    files.append(entry)
+            except (OSError, UnicodeError) as e:
+                logging.debug(f"Error accessing {entry.path}: {str(e)}")
+    # Inode order roughly follows on-disk placement, so a directory's files are read with
+    # fewer seeks; the inode comes with the directory listing except on Windows
+    if sys.platform != 'win32':
+        files.sort(key=os.DirEntry.inode)
+    return files, subdirs
+
+def scan_tree(root_dir: str) -> Iterator[os.DirEntry]:
+    """Yield regular files below root_dir, listing independent directories concurrently."""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=SCAN_THREADS, thread_name_prefix='flac_scan') as executor:
+        pending = {executor.submit(scan_directory, root_dir): root_dir}
+        while pending:
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                directory = pending.pop(future)
+                try:
+                    files, subdirs = future.result()
+                except (OSError, UnicodeError) as e:
+                    if directory == root_dir:
+                        raise
+                    logging.debug(f"Error accessing {directory}: {str(e)}")
+                    continue
+                for subdir in subdirs:
+                    pending[executor.submit(scan_directory, subdir)] = subdir
+                yield from files
+
+def iter_flac_files(root_dir: str, type_counts: List[int]) -> Iterator[FlacFile]:
+    """Yield FLAC files in the directory tree as they are found, counting every file by its EXT_INDEX slot."""
+    other = len(EXT_INDEX)
     try:
         root_path = Path(root_dir).resolve()
         logging.info(f"Searching for files in: {root_path}")
         
-        tracked_extensions = {
-            '.flac', '.mp3', '.wav', '.aac', '.m4a', '.ogg',
-            '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp',
-            '.mp4', '.mkv', '.avi', '.mov', '.wmv',
-            '.lrc', '.txt', '.log', '.cue', '.pdf',
-            '.zip', '.rar', '.7z', '.tar', '.gz'
-        }
-        
-        for path in root_path.rglob('*'):
+        # Discovery only touches directory metadata; verify_flac does the real accessibility check
+        for entry in scan_tree(str(root_path)):
             try:
-                if path.is_file() and is_file_accessible(str(path)):
-                    total_files += 1
-                    ext = path.suffix.lower()
-                    if ext in tracked_extensions:
-                        file_types[ext] += 1
-                    else:
-                        file_types['other'] += 1
-                    
-                    if ext == '.flac':
-                        flac_files.append(str(path))
-                        logging.debug(f"Found FLAC file: {path}")
-            except (OSError, PermissionError, UnicodeError) as e:
-                logging.debug(f"Error accessing {path}: {str(e)}")
+                _, dot, suffix = entry.name.rpartition('.')
+                ext = '.' + suffix.lower() if dot else ''
+                flac_file = None
+                if ext == '.flac':
+                    st = entry.stat()
+                    if st.st_size == 0:
+                        continue
+                    flac_file = FlacFile(entry.path, st.st_size, st.st_mtime_ns)
+                    if _LOG_DEBUG:
+                        logging.debug(f"Found FLAC file: {entry.path}")
+                
+                type_counts[EXT_INDEX.get(ext, other)] += 1
+            except (OSError, UnicodeError) as e:
+                logging.debug(f"Error accessing {entry.path}: {str(e)}")
                 continue
+            if flac_file:
+                yield flac_file
     
     except (OSError, PermissionError) as e:
         logging.error(f"Error scanning directory {root_dir}: {str(e)}")
-    
-    file_types['total'] = total_files
-    return flac_files, file_types
+
+def dispatch_batches(flac_files: Iterator[FlacFile], worker_count: int) -> Iterator[List[FlacFile]]:
+    """Group files into batches that grow from one file towards VERIFY_BATCH_SIZE, closing each at VERIFY_BATCH_BYTES."""
+    batch = []
+    batch_bytes = 0
+    batch_size = 1
+    dispatched = 0
+    for flac_file in flac_files:
+        if flac_file.size >= VERIFY_BATCH_BYTES:
+            yield [flac_file]
+            dispatched += 1
+            continue
+        batch.append(flac_file)
+        batch_bytes += flac_file.size
+        if len(batch) >= batch_size or batch_bytes >= VERIFY_BATCH_BYTES:
+            yield batch
+            dispatched += len(batch)
+            batch = []
+            batch_bytes = 0
+            batch_size = min(VERIFY_BATCH_SIZE, 1 + dispatched // (worker_count * 4))
+    if batch:
+        yield batch
+
+def get_cache_path() -> Optional[Path]:
+    """Locate the result cache under $XDG_CACHE_HOME or ~/.cache; None when there is no home directory."""
+    base = os.environ.get('XDG_CACHE_HOME', '')
+    if not os.path.isabs(base):
+        try:
+            base = Path.home() / '.cache'
+        except (RuntimeError, KeyError):
+            return None
+    return Path(base) / 'reflac' / 'results.db'
+
+def load_cache(cache_path: Path) -> Dict[str, Tuple[int, int, Optional[str], str]]:
+    """Load results of previous runs as {path: (mtime_ns, size, md5sum, status)}."""
+    if not cache_path.is_file():
+        return {}
+    try:
+        with closing(sqlite3.connect(str(cache_path))) as db:
+            rows = db.execute("SELECT path, mtime_ns, size, md5sum, status FROM results").fetchall()
+    except sqlite3.Error as e:
+        logging.warning(f"Ignoring unreadable result cache {cache_path}: {str(e)}")
+        return {}
+    return {path: (mtime_ns, size, md5sum, status) for path, mtime_ns, size, md5sum, status in rows}
+
+def save_cache(cache_path: Path, entries: List[Tuple[str, int, int, Optional[str], str]]) -> None:
+    """Store (path, mtime_ns, size, md5sum, status) rows for files verified in this run."""
+    if not entries:
+        return
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(str(cache_path))) as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS results "
+                       "(path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, md5sum TEXT, status TEXT)")
+            with db:
+                db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)", entries)
+    except (sqlite3.Error, OSError) as e:
+        logging.warning(f"Could not update result cache {cache_path}: {str(e)}")
 
 def check_dependencies(colors: Colors) -> bool:
     """Verify required tools are available in system PATH."""
     required_tools = ['flac', 'metaflac']
-    missing = [cmd for cmd in required_tools if not shutil.which(cmd)]
+    resolved = {cmd: shutil.which(cmd) for cmd in required_tools}
+    missing = [cmd for cmd in required_tools if not resolved[cmd]]
     
     if missing:
         print(colors.colorize("Error: The following tools are required but not found:", 'orange_red'))
@@ -277,6 +946,9 @@ def check_dependencies(colors: Colors) -> bool:
         
         logging.error(f"Missing required tools: {', '.join(missing)}")
         return False
+    
+    set_tool_paths(resolved['flac'], resolved['metaflac'])
+    set_libflac(find_libflac())
     return True
 
 def print_header(version: str, colors: Colors) -> None:
@@ -288,6 +960,15 @@ def print_header(version: str, colors: Colors) -> None:
     print(colors.colorize("Verify the integrity of your FLAC audio files".center(width), 'lavender'))
     print("=" * width + "\n")
 
+def count_file_types(type_counts: List[int]) -> Dict[str, int]:
+    """Turn the per-slot counts from iter_flac_files into the table print_file_table expects."""
+    file_types = {ext: type_counts[i] for ext, i in EXT_INDEX.items() if type_counts[i]}
+    if type_counts[-1]:
+        file_types['other'] = type_counts[-1]
+    if file_types:
+        file_types['total'] = sum(type_counts)
+    return file_types
+
 def print_file_table(file_types: Dict[str, int], colors: Colors) -> None:
     """Print a table of file types found during scanning."""
     if not file_types:
@@ -296,15 +977,7 @@ def print_file_table(file_types: Dict[str, int], colors: Colors) -> None:
     width = 60
     print(f"\n{' Files Found ':-^{width}}")
     
-    categories = {
-        "Audio": ['.flac', '.mp3', '.wav', '.aac', '.m4a', '.ogg'],
-        "Images": ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'],
-        "Video": ['.mp4', '.mkv', '.avi', '.mov', '.wmv'],
-        "Text/Docs": ['.lrc', '.txt', '.log', '.cue', '.pdf'],
-        "Archives": ['.zip', '.rar', '.7z', '.tar', '.gz'],
-    }
-    
-    for category, extensions in categories.items():
+    for category, extensions in FILE_CATEGORIES.items():
         category_count = 0
         category_items = []
         for ext in extensions:
@@ -329,38 +1002,51 @@ def print_file_table(file_types: Dict[str, int], colors: Colors) -> None:
     print(colors.colorize(f"Total files: {file_types.get('total', 0)}", 'green'))
     print("-" * width + "\n")
 
-def print_summary(results: Dict[str, int], failed_files: List[Tuple[str, str]], 
+def print_summary(results: Dict[str, int], skipped: int, failed_files: List[Tuple[str, str]], 
                  no_md5_files: List[str], log_filename: Optional[str], colors: Colors) -> None:
     """Print comprehensive summary of verification results."""
     total = sum(results.values())
     width = 80
     
-    print(f"\n{' Verification Summary ':-^{width}}")
-    print(colors.colorize(f"Total files checked: {total}", 'green'))
-    print(colors.colorize(f"Passed verification: {results['passed']}", 'green'))
-    print(colors.colorize(f"Failed verification: {results['failed']}", 'orange_red'))
-    print(colors.colorize(f"Files without MD5: {results['no_md5']}", 'yellow'))
+    # Collect the report and write it at once rather than locking and flushing stdout per line;
+    # each numbered entry is colored as one string instead of number and path separately
+    out = []
+    out.append(f"\n{' Verification Summary ':-^{width}}")
+    out.append(colors.colorize(f"Total files checked: {total}", 'green'))
+    out.append(colors.colorize(f"Passed verification: {results['passed']}", 'green'))
+    out.append(colors.colorize(f"Failed verification: {results['failed']}", 'orange_red'))
+    out.append(colors.colorize(f"Files without MD5: {results['no_md5']}", 'yellow'))
+    if skipped:
+        out.append(colors.colorize(f"Skipped as unchanged since a previous run (not re-read): {skipped}", 'lavender'))
     
     if log_filename:
-        print(colors.colorize(f"Log file created: {log_filename}", 'lavender'))
+        out.append(colors.colorize(f"Log file created: {log_filename}", 'lavender'))
     
-    print('-' * width)
+    out.append('-' * width)
     if results['failed']:
-        print(colors.colorize("Failed files:", 'orange_red'))
+        out.append(colors.colorize("Failed files:", 'orange_red'))
+        red = functools.partial(colors.colorize, color='orange_red')
         for i, (file, error) in enumerate(failed_files, 1):
-            print(f"{colors.colorize(f'{i}.', 'orange_red')} {colors.colorize(file, 'orange_red')}")
+            out.append(red(f"{i}. {file}"))
             if error:
                 for line in error.splitlines():
                     if line.strip():
-                        print(f"   {line.strip()}")
-        print('-' * width)
-
+                        out.append(f"   {line.strip()}")
+        out.append('-' * width)
+    
     if results['no_md5']:
-        print(colors.colorize("Files without MD5 checksums:", 'yellow'))
+        out.append(colors.colorize("Files without MD5 checksums:", 'yellow'))
+        yellow = functools.partial(colors.colorize, color='yellow')
+        # Paths under the working directory just lose its prefix; only others need relpath
+        cwd = os.getcwd()
+        cwd_prefix = os.path.join(cwd, '')
         for i, file in enumerate(no_md5_files, 1):
-            relative_path = os.path.relpath(file)
-            print(f"{colors.colorize(f'{i}.', 'yellow')} {colors.colorize(relative_path, 'yellow')}")
-        print('-' * width)
+            relative_path = file[len(cwd_prefix):] if file.startswith(cwd_prefix) else os.path.relpath(file, cwd)
+            out.append(yellow(f"{i}. {relative_path}"))
+        out.append('-' * width)
+    
+    sys.stdout.write('\n'.join(out) + '\n')
+    sys.stdout.flush()
 
 def normalize_path(path: str) -> str:
     """Normalize path with input validation."""
@@ -384,9 +1070,16 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument('-d', '--directory', help='Directory to scan', default='.')
     parser.add_argument('-l', '--log', action='store_true', help='Create a log file')
     parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
-    parser.add_argument('--max-threads', type=int, default=32, help='Maximum number of threads')
-    parser.add_argument('--timeout', type=int, default=30, help='Timeout for FLAC verification in seconds')
+    parser.add_argument('--max-workers', '--max-threads', dest='max_workers', type=int, default=32,
+                        help='Maximum number of worker processes')
+    parser.add_argument('--timeout', type=int, default=30, help='Timeout for verifying each FLAC file in seconds')
     parser.add_argument('--max-retries', type=int, default=2, help='Number of retries for failed operations')
+    parser.add_argument('--quick', action='store_true',
+                        help='Only check frame CRCs instead of fully decoding (does not check the MD5 signature)')
+    parser.add_argument('--prefetch', action='store_true',
+                        help='Hint the kernel to read queued files ahead of the decoders (POSIX only)')
+    parser.add_argument('--cache', action='store_true',
+                        help='Remember results, and skip files that passed a previous --cache run and are unchanged since (they are not re-read)')
     parser.add_argument('--version', action='version', version=f'FLAC Integrity Checker v{VERSION}')
     return parser.parse_args()
 
@@ -398,12 +1091,17 @@ def main() -> None:
         
         log_file, log_listener = setup_logging(args.log, args.verbose)
         if args.log and log_listener:
-            logging.getLogger().setLevel(logging.DEBUG if args.verbose else logging.INFO)
+            set_log_level(logging.DEBUG if args.verbose else logging.INFO)
         
         print_header(VERSION, colors)
         if not check_dependencies(colors):
             sys.exit(1)
         
+        # The plain CRC loop is too slow to check whole files with, so --quick needs numpy
+        if args.quick and np is None:
+            print(colors.colorize("Error: --quick requires 'numpy'. Please install it to proceed.", 'orange_red'))
+            sys.exit(1)
+        
         target_dir = normalize_path(args.directory)
         print(f"Target directory: {target_dir}")
         if not os.path.isdir(target_dir):
@@ -414,74 +1112,155 @@ def main() -> None:
                 logging.error(f"Directory not found: {target_dir}")
             sys.exit(1)
             
-        print("Searching for files...")
-        flac_files, file_types = find_files(target_dir)
-        print_file_table(file_types, colors)
-        
-        if not flac_files:
-            print(colors.colorize("No FLAC files found for verification.", 'yellow'))
-            if args.log:
-                logging.info("No FLAC files found for verification.")
-            sys.exit(0)
-        
         if not tqdm and args.verbose:
             print(colors.colorize("Progress bar unavailable: install 'tqdm' for progress tracking.", 'yellow'))
         
-        print(colors.colorize(f"Starting verification of {len(flac_files)} FLAC files", 'green'))
-        if args.log:
-            logging.info(f"Starting verification of {len(flac_files)} FLAC files")
+        if args.prefetch and not hasattr(os, 'posix_fadvise'):
+            args.prefetch = False
+            if args.verbose:
+                print(colors.colorize("Prefetching unavailable: this platform has no posix_fadvise.", 'yellow'))
         
-        thread_count = get_optimal_threads(args.max_threads)
-        print(f"Using {thread_count} threads for verification...")
+        worker_count = get_optimal_workers(args.max_workers)
+        print(f"Using {worker_count} worker processes for verification...")
         if args.log:
-            logging.info(f"Using {thread_count} threads for verification")
+            logging.info(f"Using {worker_count} worker processes for verification")
+        
+        if LIBFLAC and not args.quick:
+            print(f"Decoding in-process with {LIBFLAC}")
+            if args.log:
+                logging.info(f"Decoding in-process with {LIBFLAC}")
         
         results = {'passed': 0, 'failed': 0, 'no_md5': 0}
         failed_files = []
         no_md5_files = []
+        type_counts = [0] * (len(EXT_INDEX) + 1)
+        skipped = 0
+        
+        cache_path = get_cache_path() if args.cache else None
+        if cache_path is None and args.cache:
+            print(colors.colorize("Result cache unavailable: no home directory or XDG_CACHE_HOME.", 'yellow'))
+        cache = load_cache(cache_path) if cache_path else {}
+        verify = functools.partial(quick_verify_batch if args.quick else verify_flac_batch, timeout=args.timeout, max_retries=args.max_retries, verbose=args.verbose)
+        file_info = {}  # Files handed out for verification whose results have not come back yet
+        # A quick check is weaker than a full decode, so only full results are remembered
+        cache_entries = [] if cache_path and not args.quick else None
+        log_queue = log_listener.queue if log_listener else None
+        
+        print(colors.colorize("Searching for and verifying FLAC files...", 'green'))
+        if args.log:
+            logging.info("Starting verification")
+        
+        def make_pool(mp_context) -> concurrent.futures.ProcessPoolExecutor:
+            return concurrent.futures.ProcessPoolExecutor(max_workers=worker_count, mp_context=mp_context, initializer=init_worker,
+                                                          initargs=(log_queue, logging.getLogger().level,
+                                                                    FLAC_BIN, METAFLAC_BIN, LIBFLAC, not args.prefetch))
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=thread_count, thread_name_prefix='flac_verify') as executor:
-            futures = {executor.submit(verify_flac, f, args.timeout, args.max_retries, args.verbose): f for f in flac_files}
-            progress_bar = tqdm(total=len(futures), unit="file", leave=True, 
+        # Forked workers start without re-importing this script; elsewhere only spawn is safe.
+        # A pool replacing one a crashed worker broke is always spawned, as discovery and
+        # prefetch threads are running by then
+        spawn_context = multiprocessing.get_context('spawn')
+        with make_pool(multiprocessing.get_context('fork') if sys.platform.startswith('linux') else spawn_context) as executor:
+            # Start every worker now, before discovery starts its scan threads. Python 3.11+ (and
+            # 3.7/3.8) fork the whole pool on the first submission, but 3.9 and 3.10 fork workers
+            # on demand, so one task per worker is submitted at once to get each of them started
+            concurrent.futures.wait([executor.submit(int) for _ in range(worker_count)])
+            
+            # Let tqdm redraw at most a few times a second rather than on every completion, and
+            # not at all for runs over within PROGRESS_BAR_DELAY (the total is not known up front)
+            progress_bar = tqdm(total=0, unit="file", leave=True, mininterval=0.25, miniters=16, smoothing=0.05,
+                               delay=PROGRESS_BAR_DELAY,
                                bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]") if tqdm else None
+            # Decide once whether there is a bar to update rather than on every report
+            update_progress = progress_bar.update if progress_bar is not None else (lambda n: None)
+            unreported = 0
+            last_report = time.monotonic()
+            
+            def pending_files() -> Iterator[FlacFile]:
+                """Discovered files still needing verification; the bar's total grows with them."""
+                nonlocal skipped
+                for flac_file in iter_flac_files(target_dir, type_counts):
+                    # Files that passed on a previous run and are unchanged since need no second decode
+                    cached = cache.get(flac_file.path)
+                    if cached and cached[:2] == (flac_file.mtime_ns, flac_file.size) and cached[3] == 'passed':
+                        skipped += 1
+                        continue
+                    file_info[flac_file.path] = flac_file
+                    if progress_bar is not None:
+                        progress_bar.total += 1
+                    yield flac_file
             
-            for future in concurrent.futures.as_completed(futures):
+            # Discovery runs as bounded_map pulls batches, so directory listing overlaps with
+            # verification; only a few batches per worker are queued at once so memory stays
+            # flat however large the library is
+            batches = dispatch_batches(pending_files(), worker_count)
+            # Started only now that the workers exist, so none is forked beside this thread
+            prefetcher = Prefetcher() if args.prefetch else None
+            if prefetcher:
+                batches = prefetcher.feed(batches)
+            batches = ([f.path for f in batch] for batch in batches)
+            recheck = functools.partial(recheck_batch, timeout=args.timeout, max_retries=args.max_retries, verbose=args.verbose)
+            for batch, future in bounded_map(executor, verify, batches, max_pending=worker_count * 4,
+                                             new_executor=lambda: make_pool(spawn_context), fallback=recheck):
                 try:
-                    result = future.result()
-                    if result.status == 'passed':
+                    batch_results = future.result()
+                except Exception as e:
+                    # An unexpected error, or a crash during the re-check, fails the whole batch, not the run
+                    batch_results = [(file_path, FAILED, f"Processing error: {str(e)}", None) for file_path in batch]
+                    if args.log:
+                        logging.error(f"Error processing a batch of {len(batch)} files: {str(e)}")
+                if prefetcher:
+                    prefetcher.release(batch)
+                for file_path, status, error, md5sum in batch_results:
+                    flac_file = file_info.pop(file_path)
+                    if cache_entries is not None:
+                        cache_entries.append((file_path, flac_file.mtime_ns, flac_file.size, md5sum, STATUS_NAMES[status]))
+                    if status == PASSED:
                         results['passed'] += 1
                         if args.log and args.verbose:
-                            logging.debug(f"Passed: {result.file_path}")
-                    elif result.status == 'failed':
+                            logging.debug(f"Passed: {file_path}")
+                    elif status == FAILED:
                         results['failed'] += 1
-                        failed_files.append((result.file_path, result.error or ""))
+                        failed_files.append((file_path, error or ""))
                         if args.log:
-                            logging.warning(f"Failed: {result.file_path} - {result.error}")
+                            logging.warning(f"Failed: {file_path} - {error}")
                     else:
                         results['no_md5'] += 1
-                        no_md5_files.append(result.file_path)
+                        no_md5_files.append(file_path)
                         if args.log:
-                            logging.info(f"No MD5: {result.file_path}")
-                except (OSError, subprocess.SubprocessError) as e:
-                    file = futures[future]
-                    results['failed'] += 1
-                    error_msg = f"Processing error: {str(e)}"
-                    failed_files.append((file, error_msg))
-                    if args.log:
-                        logging.error(f"Error processing {file}: {str(e)}")
-                finally:
-                    if progress_bar:
-                        progress_bar.update(1)
+                            logging.info(f"No MD5: {file_path}")
+                unreported += len(batch_results)
+                if unreported >= PROGRESS_UPDATE_FILES or time.monotonic() - last_report >= 0.25:
+                    update_progress(unreported)
+                    unreported = 0
+                    last_report = time.monotonic()
             
-            if progress_bar:
+            update_progress(unreported)
+            if progress_bar is not None:
                 progress_bar.close()
+            if prefetcher:
+                prefetcher.close()
+        
+        print_file_table(count_file_types(type_counts), colors)
+        if skipped and args.log:
+            logging.info(f"Skipped {skipped} unchanged files that passed on a previous run")
+        if not sum(results.values()) and not skipped:
+            print(colors.colorize("No FLAC files found for verification.", 'yellow'))
+            if args.log:
+                logging.info("No FLAC files found for verification.")
+            sys.exit(0)
+        
+        if cache_entries is not None:
+            save_cache(cache_path, cache_entries)
         
         print(colors.colorize("\nVerification Complete", 'lavender'))
         if args.log:
             logging.info("Verification Complete")
-            logging.info(f"Results: Passed={results['passed']}, Failed={results['failed']}, No MD5={results['no_md5']}")
+            logging.info(f"Results: Passed={results['passed']}, Failed={results['failed']}, No MD5={results['no_md5']}, Skipped={skipped}")
         
-        print_summary(results, failed_files, no_md5_files, log_file, colors)
+        # Batches complete in arbitrary order; keep reports stable
+        failed_files.sort()
+        no_md5_files.sort()
+        print_summary(results, skipped, failed_files, no_md5_files, log_file, colors)
         if log_listener:
             log_listener.stop()
         
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 import os
+import re
 import sys
 import subprocess
-import multiprocessing
 import argparse
+import shutil
 import threading
 from concurrent.futures import ThreadPoolExecutor
 import math
@@ -12,6 +13,10 @@ from colorama import init, Fore, Style
 # Initialize colorama for cross-platform colored output
 init()
 
+REDRAW_INTERVAL = 0.05  # Status bar redraw period in seconds
+# Version and copyright lines flac prints ahead of its error report, newline included
+FLAC_BANNER_RE = re.compile(r"^(?:.*(?:Copyright|NO WARRANTY|Type `flac')|[ \t\r\f\v]*flac ).*\n?", re.M)
+
 class ProgressTracker:
     def __init__(self, total):
         self.total = total
@@ -20,9 +25,22 @@ class ProgressTracker:
         self.failed = 0
         self.lock = threading.Lock()
         self.errors = []
+        self.last_drawn = None  # (progress, success, failed) currently on screen
+        # Only this thread writes the status bar, so workers never wait on the terminal
+        self.finished = threading.Event()
+        self.writer = threading.Thread(target=self._redraw_loop, daemon=True)
+
+    def start(self):
+        """Start redrawing the status bar in the background"""
+        self.writer.start()
+
+    def finish(self):
+        """Stop redrawing and leave the final state on screen"""
+        self.finished.set()
+        self.writer.join()
 
     def update(self, success, error_info=None):
-        """Update progress and display the status bar"""
+        """Record the outcome of one file"""
         with self.lock:
             self.progress += 1
             if success:
@@ -31,32 +49,43 @@ class ProgressTracker:
                 self.failed += 1
                 if error_info:
                     self.errors.append(error_info)
-            
-            # Create status bar with aligned elements
-            width = 50
-            filled = int(width * self.progress / self.total)
-            bar = '#' * filled + ' ' * (width - filled)
-            percent = f"{int(100 * self.progress / self.total):3d}"  # 3-digit percentage
-            progress_str = f"{self.progress:>{len(str(self.total))}}/{self.total}"  # Aligned progress
-            success_text = f"{Fore.GREEN}Success: {self.success:<4}{Style.RESET_ALL}"
-            failed_text = f"{Fore.RED}Failed: {self.failed:<4}{Style.RESET_ALL}"
-            status = f"[{bar}] {percent}% ({progress_str}) | {success_text} | {failed_text}"
-            
-            sys.stdout.write(f"\r{status}")
-            sys.stdout.flush()
-            
-            if self.progress == self.total:
-                print("\n")  # Extra newline for separation
-
-def recompress_flac(file_path, tracker, compression_level):
+
+    def _redraw_loop(self):
+        """Redraw every REDRAW_INTERVAL until finish() is called, then draw once more"""
+        while not self.finished.wait(REDRAW_INTERVAL):
+            self.draw()
+        self.draw()
+        print("\n")  # Extra newline for separation
+
+    def draw(self):
+        """Display the status bar, unless it already shows the current counts"""
+        with self.lock:
+            progress, success, failed = self.progress, self.success, self.failed
+        if (progress, success, failed) == self.last_drawn:
+            return
+        self.last_drawn = (progress, success, failed)
+        
+        # Create status bar with aligned elements
+        width = 50
+        filled = int(width * progress / self.total)
+        bar = '#' * filled + ' ' * (width - filled)
+        percent = f"{int(100 * progress / self.total):3d}"  # 3-digit percentage
+        progress_str = f"{progress:>{len(str(self.total))}}/{self.total}"  # Aligned progress
+        success_text = f"{Fore.GREEN}Success: {success:<4}{Style.RESET_ALL}"
+        failed_text = f"{Fore.RED}Failed: {failed:<4}{Style.RESET_ALL}"
+        status = f"[{bar}] {percent}% ({progress_str}) | {success_text} | {failed_text}"
+        
+        sys.stdout.write(f"\r{status}")
+        sys.stdout.flush()
+
+def recompress_flac(file_path, tracker, compression_level, flac_bin="flac"):
     """Recompress a FLAC file using the specified compression level"""
     try:
-        # Check if FLAC is installed
-        subprocess.run(["flac", "--version"], capture_output=True, check=True)
-        
         subprocess.run(
-            ["flac", f"-{compression_level}", "-f", str(file_path)],
-            capture_output=True,
+            [flac_bin, "-s", f"-{compression_level}", "-f", str(file_path)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            close_fds=False,
             check=True
         )
         tracker.update(True)
@@ -67,12 +96,7 @@ def recompress_flac(file_path, tracker, compression_level):
     except subprocess.CalledProcessError as e:
         error_msg = f"Failed to process {Fore.RED}{file_path}{Style.RESET_ALL}:\n"
         # Filter out version and copyright lines
-        lines = e.stderr.decode().split('\n')
-        filtered_lines = [line for line in lines 
-                         if "Copyright" not in line 
-                         and "NO WARRANTY" not in line 
-                         and "Type `flac'" not in line 
-                         and not line.strip().startswith("flac ")]
+        filtered_lines = FLAC_BANNER_RE.sub('', e.stderr.decode()).split('\n')
         # Clean up and format error output
         for i, line in enumerate(filtered_lines):
             if line.strip() and os.path.basename(file_path) in line and i == 0:
@@ -101,8 +125,12 @@ def main():
                        help='Compression level from 0 to 8 (default: 5)')
     args = parser.parse_args()
 
-    # Calculate thread count (75% of available CPU threads)
-    max_threads = max(1, math.floor(multiprocessing.cpu_count() * 0.75))
+    # Calculate thread count (75% of the CPU threads this process may run on)
+    if hasattr(os, 'sched_getaffinity'):
+        cpu_count = len(os.sched_getaffinity(0))
+    else:
+        cpu_count = os.cpu_count() or 1
+    max_threads = max(1, math.floor(cpu_count * 0.75))
 
     # Validate directory
     directory = clean_path(args.directory)
@@ -119,6 +147,12 @@ def main():
         print("No FLAC files were found in the specified directory.")
         return
 
+    # Check if FLAC is installed
+    flac_bin = shutil.which('flac')
+    if flac_bin is None:
+        print("The FLAC tool is not installed. Please install 'flac' to proceed.")
+        return
+
     # Display configuration and ask for confirmation
     print(f"\nDirectory scanned: {directory}")
     print(f"Files found: {len(flac_files)}")
@@ -136,11 +170,13 @@ def main():
 
     # Start processing
     tracker = ProgressTracker(len(flac_files))
+    tracker.start()
     with ThreadPoolExecutor(max_workers=max_threads) as executor:
-        futures = [executor.submit(recompress_flac, file_path, tracker, args.compression) 
+        futures = [executor.submit(recompress_flac, file_path, tracker, args.compression, flac_bin) 
                   for file_path in flac_files]
         for future in futures:
             future.result()
+    tracker.finish()
 
     # Completion message
     print("Recompression process finished.")